@@ -6,11 +6,12 @@ import argparse
 from pathlib import Path
 from typing import Sequence
 
+from . import cliutil
 from . import config
 from . import io_utils
-from . import kgrams
 from . import lsh
 from . import reporting
+from . import tableutil
 
 
 def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
@@ -45,35 +46,15 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
         action="store_true",
         help="Disable printing results to the terminal",
     )
+    parser.add_argument(
+        "--workers",
+        type=cliutil.non_negative_int,
+        default=1,
+        help="Worker processes for k-gram specs (0 for CPU count, 1 for serial; default: 1)",
+    )
     return parser.parse_args(argv)
 
 
-def write_csv(path: Path, headers: Sequence[str], rows: Sequence[Sequence[str]]) -> None:
-    """Write a simple CSV file."""
-    lines = [",".join(headers)]
-    for row in rows:
-        lines.append(",".join(row))
-    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
-
-
-def format_table(headers: Sequence[str], rows: Sequence[Sequence[str]]) -> str:
-    """Format rows as a fixed-width table for terminal output."""
-    if not rows:
-        return "No rows to display."
-
-    widths = [len(h) for h in headers]
-    for row in rows:
-        for index, cell in enumerate(row):
-            widths[index] = max(widths[index], len(cell))
-
-    header_line = " | ".join(h.ljust(widths[i]) for i, h in enumerate(headers))
-    separator = "-+-".join("-" * width for width in widths)
-    body_lines = [
-        " | ".join(cell.ljust(widths[i]) for i, cell in enumerate(row)) for row in rows
-    ]
-    return "\n".join([header_line, separator, *body_lines])
-
-
 def run() -> None:
     """Run Parts 1–3 and write outputs."""
     args = parse_args()
@@ -84,20 +65,22 @@ def run() -> None:
     documents = io_utils.load_documents(args.data_dir, config.DOC_NAMES)
 
     # Part 1: k-grams and pairwise Jaccard
-    kgram_jaccards = reporting.compute_kgram_jaccards(documents, config.KGRAM_SPECS)
+    kgram_jaccards, grams_by_spec = reporting.compute_kgram_jaccards_with_grams(
+        documents, config.KGRAM_SPECS, workers=args.workers or None
+    )
     part1_rows: list[list[str]] = []
     for kgram_type, pairs in kgram_jaccards.items():
         for (doc_a, doc_b), value in pairs.items():
             part1_rows.append([kgram_type, doc_a, doc_b, f"{value:.6f}"])
 
-    write_csv(
+    cliutil.write_csv(
         output_dir / "part1_kgrams_jaccard.csv",
         headers=["kgram_type", "doc_a", "doc_b", "jaccard"],
         rows=part1_rows,
     )
 
-    # Part 2: MinHash for D1 vs D2 with 3-grams (characters)
-    grams_3 = kgrams.build_kgrams_for_documents(documents, "char", 3)
+    # Part 2: MinHash for D1 vs D2 with 3-grams (characters), reused from Part 1
+    grams_3 = grams_by_spec["char_3"]
     d1_grams = grams_3["D1"]
     d2_grams = grams_3["D2"]
 
@@ -120,7 +103,7 @@ def run() -> None:
             ]
         )
 
-    write_csv(
+    cliutil.write_csv(
         output_dir / "part2_minhash_d1_d2.csv",
         headers=["t", "estimate", "exact", "abs_error"],
         rows=part2_rows,
@@ -165,7 +148,7 @@ def run() -> None:
             ]
         )
 
-    write_csv(
+    cliutil.write_csv(
         output_dir / "part3_lsh_probabilities.csv",
         headers=["doc_a", "doc_b", "jaccard_3gram", "probability"],
         rows=part3_rows,
@@ -173,10 +156,12 @@ def run() -> None:
 
     if not args.no_print:
         print("\n=== Part 1: K-grams Jaccard ===")
-        print(format_table(["kgram_type", "doc_a", "doc_b", "jaccard"], part1_rows))
+        print(
+            tableutil.format_table(["kgram_type", "doc_a", "doc_b", "jaccard"], part1_rows)
+        )
 
         print("\n=== Part 2: MinHash Estimates (D1 vs D2) ===")
-        print(format_table(["t", "estimate", "exact", "abs_error"], part2_rows))
+        print(tableutil.format_table(["t", "estimate", "exact", "abs_error"], part2_rows))
         print("\n" + recommendation_text.strip())
 
         print("\n=== Part 3: LSH Parameters ===")
@@ -184,7 +169,7 @@ def run() -> None:
 
         print("\n=== Part 3: LSH Probabilities (3-grams) ===")
         print(
-            format_table(
+            tableutil.format_table(
                 ["doc_a", "doc_b", "jaccard_3gram", "probability"], part3_rows
             )
         )
@@ -3,13 +3,18 @@
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Sequence
+from typing import AbstractSet, Sequence
 
+import numpy as np
+
+from . import cliutil
 from . import config
 from . import lsh
 from . import movielens
 from . import movielens_analysis
+from . import tableutil
 
 
 def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
@@ -56,37 +61,80 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
         default=10,
         help="Max rows to print for large tables (0 for all)",
     )
+    parser.add_argument(
+        "--workers",
+        type=cliutil.non_negative_int,
+        default=0,
+        help="Worker processes for MinHash signatures (0 for CPU count, 1 for serial; default: 0)",
+    )
     return parser.parse_args(argv)
 
 
-def write_csv(path: Path, headers: Sequence[str], rows: Sequence[Sequence[str]]) -> None:
-    """Write a simple CSV file."""
-    lines = [",".join(headers)]
-    for row in rows:
-        lines.append(",".join(row))
-    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
-
-
-def format_table(
-    headers: Sequence[str], rows: Sequence[Sequence[str]], limit: int | None
-) -> str:
-    """Format rows as a fixed-width table for terminal output."""
-    if limit is not None:
-        rows = rows[:limit]
-    if not rows:
-        return "No rows to display."
-
-    widths = [len(h) for h in headers]
-    for row in rows:
-        for index, cell in enumerate(row):
-            widths[index] = max(widths[index], len(cell))
-
-    header_line = " | ".join(h.ljust(widths[i]) for i, h in enumerate(headers))
-    separator = "-+-".join("-" * width for width in widths)
-    body_lines = [
-        " | ".join(cell.ljust(widths[i]) for i, cell in enumerate(row)) for row in rows
+def format_pair_rows(
+    pairs: movielens_analysis.PairArrays,
+) -> list[list[str]]:
+    """Format (user_a, user_b, similarity) rows in one vectorized pass."""
+    user_a, user_b, sims = pairs
+    if not len(sims):
+        return []
+    return [
+        list(row)
+        for row in zip(
+            user_a.astype(str).tolist(),
+            user_b.astype(str).tolist(),
+            np.char.mod("%.6f", sims).tolist(),
+        )
     ]
-    return "\n".join([header_line, separator, *body_lines])
+
+
+def format_pair_lines(
+    pairs: movielens_analysis.PairArrays,
+) -> list[bytes]:
+    """Format pairs as pre-encoded b"user_a,user_b,similarity" CSV lines."""
+    user_a, user_b, sims = pairs
+    if not len(sims):
+        return []
+    lines = user_a.astype(bytes)
+    for column in (user_b.astype(bytes), np.char.mod(b"%.6f", sims)):
+        lines = np.char.add(np.char.add(lines, b","), column)
+    return lines.tolist()
+
+
+_worker_user_sets: list[np.ndarray] = []
+
+
+def _init_signature_worker(user_sets: list[np.ndarray]) -> None:
+    """Store the user sets once per worker process instead of once per task."""
+    global _worker_user_sets
+    _worker_user_sets = user_sets
+
+
+def _signature_worker(task: tuple[int, int, int]) -> np.ndarray:
+    """Compute one (t, m, seed) signature matrix inside a worker process."""
+    t, m, seed = task
+    return movielens_analysis.minhash_signatures_matrix(
+        user_sets=_worker_user_sets, t=t, m=m, seed=seed
+    )
+
+
+def compute_signatures(
+    user_sets: list[np.ndarray],
+    tasks: Sequence[tuple[int, int, int]],
+    workers: int | None,
+) -> list[np.ndarray]:
+    """Compute a signature matrix per (t, m, seed) task, in task order.
+
+    Tasks run in a process pool unless workers is 1.
+    """
+    if workers == 1:
+        _init_signature_worker(user_sets)
+        return [_signature_worker(task) for task in tasks]
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_signature_worker,
+        initargs=(user_sets,),
+    ) as executor:
+        return list(executor.map(_signature_worker, tasks))
 
 
 def run() -> None:
@@ -95,29 +143,27 @@ def run() -> None:
     output_dir: Path = args.output_dir
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    user_movies = movielens.load_user_movie_sets(args.ratings_path)
+    user_movies = movielens.load_user_movie_arrays(args.ratings_path)
     user_ids = movielens.sorted_user_ids(user_movies)
     user_sets = [user_movies[user_id] for user_id in user_ids]
     print_limit = None if args.print_limit <= 0 else args.print_limit
 
-    # Exact Jaccard for all pairs
-    exact_jaccard = movielens_analysis.compute_exact_jaccard(user_ids, user_sets)
-
-    # True pairs for thresholds
-    true_pairs_by_threshold: dict[float, set[movielens_analysis.Pair]] = {}
-    for threshold in (config.MOVIELENS_SIM_THRESHOLD, *config.MOVIELENS_LSH_THRESHOLDS):
-        true_pairs_by_threshold[threshold] = movielens_analysis.pairs_above_threshold(
-            exact_jaccard, threshold
-        )
+    # Exact Jaccard as pair arrays for the lowest threshold used; higher
+    # thresholds are masks over the same arrays
+    thresholds = (config.MOVIELENS_SIM_THRESHOLD, *config.MOVIELENS_LSH_THRESHOLDS)
+    exact_arrays = movielens_analysis.compute_exact_jaccard_arrays(
+        user_ids, user_sets, threshold=min(thresholds)
+    )
+    true_pairs_by_threshold: dict[float, set[movielens_analysis.Pair]] = {
+        threshold: movielens_analysis.pairs_above_threshold(exact_arrays, threshold)
+        for threshold in thresholds
+    }
 
     # Part 4: output pairs with exact similarity >= 0.5
-    exact_pairs = true_pairs_by_threshold[config.MOVIELENS_SIM_THRESHOLD]
-    exact_rows: list[list[str]] = []
-    for (u, v), sim in exact_jaccard.items():
-        if (u, v) in exact_pairs:
-            exact_rows.append([str(u), str(v), f"{sim:.6f}"])
+    sim_mask = exact_arrays[2] >= config.MOVIELENS_SIM_THRESHOLD
+    exact_rows = format_pair_rows(tuple(array[sim_mask] for array in exact_arrays))
 
-    write_csv(
+    cliutil.write_csv(
         output_dir / "part4_exact_pairs_ge_0_5.csv",
         headers=["user_a", "user_b", "jaccard"],
         rows=exact_rows,
@@ -125,34 +171,42 @@ def run() -> None:
 
     # Part 4: MinHash estimates (t=50,100,200), 5 runs
     part4_summary_rows: list[list[str]] = []
-    run1_pairs_by_t: dict[int, dict[movielens_analysis.Pair, float]] = {}
+    run1_pairs_by_t: dict[int, movielens_analysis.PairArrays] = {}
 
-    # Precompute signatures for each t and run
-    signatures_by_t: dict[int, list[object]] = {}
-    for t in config.MOVIELENS_T_VALUES:
-        signatures_by_t[t] = []
-        for run_index in range(args.runs):
-            seed = args.seed + run_index
-            signatures = movielens_analysis.minhash_signatures_matrix(
-                user_sets=user_sets,
-                t=t,
-                m=args.minhash_m,
-                seed=seed,
-            )
-            signatures_by_t[t].append(signatures)
+    # Precompute signatures for each t and run (runs are independent)
+    signature_tasks = [
+        (t, args.minhash_m, args.seed + run_index)
+        for t in config.MOVIELENS_T_VALUES
+        for run_index in range(args.runs)
+    ]
+    all_signatures = compute_signatures(
+        user_sets, signature_tasks, args.workers or None
+    )
+    signatures_by_t: dict[int, list[np.ndarray]] = {
+        t: all_signatures[index * args.runs : (index + 1) * args.runs]
+        for index, t in enumerate(config.MOVIELENS_T_VALUES)
+    }
 
+    for t in config.MOVIELENS_T_VALUES:
         fp_total = 0
         fn_total = 0
-        run1_pairs: dict[movielens_analysis.Pair, float] | None = None
+        run1_pairs: movielens_analysis.PairArrays | None = None
         for run_index, signatures in enumerate(signatures_by_t[t]):
-            estimated_pairs = movielens_analysis.estimated_pairs_from_signatures(
-                user_ids=user_ids,
-                signatures=signatures,
-                threshold=config.MOVIELENS_SIM_THRESHOLD,
-            )
+            # Only run 1 needs the estimates themselves (for its CSV)
+            predicted_set: AbstractSet[movielens_analysis.Pair]
             if run_index == 0:
-                run1_pairs = estimated_pairs
-            predicted_set = set(estimated_pairs.keys())
+                run1_pairs = movielens_analysis.estimated_pair_arrays(
+                    user_ids=user_ids,
+                    signatures=signatures,
+                    threshold=config.MOVIELENS_SIM_THRESHOLD,
+                )
+                predicted_set = movielens_analysis.pair_keys(run1_pairs)
+            else:
+                predicted_set = movielens_analysis.estimated_pairs_keys_from_signatures(
+                    user_ids=user_ids,
+                    signatures=signatures,
+                    threshold=config.MOVIELENS_SIM_THRESHOLD,
+                )
             fp, fn = movielens_analysis.compute_fp_fn(
                 predicted_set, true_pairs_by_threshold[config.MOVIELENS_SIM_THRESHOLD]
             )
@@ -165,26 +219,25 @@ def run() -> None:
 
         if run1_pairs is not None:
             run1_pairs_by_t[t] = run1_pairs
-            run1_rows = [
-                [str(u), str(v), f"{sim:.6f}"] for (u, v), sim in run1_pairs.items()
-            ]
-            write_csv(
+            cliutil.write_csv(
                 output_dir / f"part4_minhash_pairs_t{t}_run1.csv",
                 headers=["user_a", "user_b", "estimate"],
-                rows=run1_rows,
+                rows=format_pair_lines(run1_pairs),
             )
 
-    write_csv(
+    cliutil.write_csv(
         output_dir / "part4_minhash_summary.csv",
         headers=["t", "avg_false_positives", "avg_false_negatives"],
         rows=part4_summary_rows,
     )
 
     # Part 5: LSH with fixed parameters for thresholds 0.6 and 0.8
+    part5_rows_by_tau: dict[float, list[list[str]]] = {}
     part5_candidate_counts: dict[float, list[tuple[int, int, int, int]]] = {}
-    part5_candidate_pairs: dict[float, dict[tuple[int, int, int], set[movielens_analysis.Pair]]] = {}
+    part5_candidate_pairs: dict[float, dict[tuple[int, int, int], list[movielens_analysis.Pair]]] = {}
     for tau in config.MOVIELENS_LSH_THRESHOLDS:
         part5_rows: list[list[str]] = []
+        part5_rows_by_tau[tau] = part5_rows
         true_pairs = true_pairs_by_threshold[tau]
         part5_candidate_counts[tau] = []
         part5_candidate_pairs[tau] = {}
@@ -220,19 +273,18 @@ def run() -> None:
             )
 
             if run1_candidates is not None:
-                part5_candidate_counts[tau].append((t, r, b, len(run1_candidates)))
-                part5_candidate_pairs[tau][(t, r, b)] = run1_candidates
-                candidate_rows = [
-                    [str(u), str(v)] for (u, v) in sorted(run1_candidates)
-                ]
-                write_csv(
+                sorted_candidates = sorted(run1_candidates)
+                part5_candidate_counts[tau].append((t, r, b, len(sorted_candidates)))
+                part5_candidate_pairs[tau][(t, r, b)] = sorted_candidates
+                candidate_rows = ([str(u), str(v)] for (u, v) in sorted_candidates)
+                cliutil.write_csv(
                     output_dir
                     / f"part5_lsh_candidates_tau_{tau:.1f}_t{t}_r{r}_b{b}_run1.csv",
                     headers=["user_a", "user_b"],
                     rows=candidate_rows,
                 )
 
-        write_csv(
+        cliutil.write_csv(
             output_dir / f"part5_lsh_summary_tau_{tau:.1f}.csv",
             headers=["t", "r", "b", "avg_false_positives", "avg_false_negatives"],
             rows=part5_rows,
@@ -255,27 +307,39 @@ def run() -> None:
             [str(u), str(v), f"{sim:.6f}"] for u, v, sim in exact_display
         ]
         print("\n--- Part 4: Exact pairs (top rows) ---")
-        print(format_table(["user_a", "user_b", "jaccard"], exact_table_rows, print_limit))
+        print(
+            tableutil.format_table(
+                ["user_a", "user_b", "jaccard"], exact_table_rows, print_limit
+            )
+        )
 
         print("\n--- Part 4: MinHash summary ---")
         print(
-            format_table(
+            tableutil.format_table(
                 ["t", "avg_false_positives", "avg_false_negatives"],
                 part4_summary_rows,
                 None,
             )
         )
 
-        for t, pairs in run1_pairs_by_t.items():
+        for t, pair_arrays in run1_pairs_by_t.items():
+            pairs = movielens_analysis.pair_arrays_to_dict(pair_arrays)
             pair_list = sorted(pairs.items(), key=lambda x: x[1], reverse=True)
             rows = [[str(u), str(v), f"{sim:.6f}"] for (u, v), sim in pair_list]
             print(f"\n--- Part 4: MinHash pairs run1 (t={t}) ---")
-            print(format_table(["user_a", "user_b", "estimate"], rows, print_limit))
+            print(
+                tableutil.format_table(["user_a", "user_b", "estimate"], rows, print_limit)
+            )
 
         for tau in config.MOVIELENS_LSH_THRESHOLDS:
-            summary_path = output_dir / f"part5_lsh_summary_tau_{tau:.1f}.csv"
             print(f"\n--- Part 5: LSH summary (tau={tau:.1f}) ---")
-            print(summary_path.read_text(encoding="utf-8").strip())
+            print(
+                tableutil.format_table(
+                    ["t", "r", "b", "avg_false_positives", "avg_false_negatives"],
+                    part5_rows_by_tau[tau],
+                    None,
+                )
+            )
 
             print(f"\n--- Part 5: LSH run1 candidate counts (tau={tau:.1f}) ---")
             candidate_rows = [
@@ -283,7 +347,7 @@ def run() -> None:
                 for t, r, b, count in part5_candidate_counts[tau]
             ]
             print(
-                format_table(
+                tableutil.format_table(
                     ["t", "r", "b", "run1_candidate_count"],
                     candidate_rows,
                     None,
@@ -292,9 +356,9 @@ def run() -> None:
 
             print(f"\n--- Part 5: LSH run1 candidate pairs (tau={tau:.1f}) ---")
             for (t, r, b), pairs in part5_candidate_pairs[tau].items():
-                pair_rows = [[str(u), str(v)] for (u, v) in sorted(pairs)]
+                pair_rows = [[str(u), str(v)] for (u, v) in pairs]
                 print(f"\nConfig t={t}, r={r}, b={b}")
-                print(format_table(["user_a", "user_b"], pair_rows, None))
+                print(tableutil.format_table(["user_a", "user_b"], pair_rows, None))
 
     print("\nMovieLens outputs written to:", output_dir)
 
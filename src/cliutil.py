@@ -0,0 +1,34 @@
+"""Argument parsing and CSV writing helpers shared by both CLIs."""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Iterable, Sequence
+
+_CSV_BUFFER_SIZE = 1 << 20
+
+
+def non_negative_int(value: str) -> int:
+    """Parse a non-negative integer CLI argument."""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be >= 0, got {value}")
+    return number
+
+
+def write_csv(
+    path: Path, headers: Sequence[str], rows: Iterable[Sequence[str] | bytes]
+) -> None:
+    """Write a simple CSV file in binary mode through a buffered writer.
+
+    Rows are either sequences of cells or pre-encoded ``bytes`` lines
+    (without the trailing newline), which are written as-is.
+    """
+    with path.open("wb", buffering=_CSV_BUFFER_SIZE) as handle:
+        handle.write(",".join(headers).encode("utf-8") + b"\n")
+        for row in rows:
+            if isinstance(row, bytes):
+                handle.write(row + b"\n")
+            else:
+                handle.write(",".join(row).encode("utf-8") + b"\n")
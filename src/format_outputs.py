@@ -4,11 +4,21 @@ from __future__ import annotations
 
 import argparse
 import csv
+import fnmatch
+from itertools import islice
+import json
+import os
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Iterable, Iterator, Sequence
 
 from . import config
 
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Records the max_rows each Markdown table was built with, so tables cut to
+# a different row limit are rebuilt rather than reused.
+_MARKDOWN_MANIFEST = ".markdown_tables.json"
+
 _TITLE_MAP: dict[str, str] = {
     "part1_kgrams_jaccard.md": "Part 1: K-grams Jaccard",
     "part2_minhash_d1_d2.md": "Part 2: MinHash Estimates (D1 vs D2)",
@@ -25,53 +35,53 @@ def csv_to_markdown(
     output_path: Path,
     max_rows: int | None = None,
 ) -> None:
-    """Convert a CSV file into a Markdown table."""
-    with input_path.open("r", encoding="utf-8") as handle:
+    """Convert a CSV file into a Markdown table, streaming row by row."""
+    with input_path.open("r", encoding="utf-8", newline="") as handle:
         reader = csv.reader(handle)
         headers = next(reader, None)
         if headers is None:
             raise ValueError(f"Empty CSV file: {input_path}")
-        rows = list(reader)
-
-    if max_rows is not None:
-        rows = rows[:max_rows]
+        rows = reader if max_rows is None else islice(reader, max_rows)
 
-    lines: list[str] = []
-    lines.append("| " + " | ".join(headers) + " |")
-    lines.append("|" + "|".join(["---"] * len(headers)) + "|")
-    for row in rows:
-        lines.append("| " + " | ".join(row) + " |")
-
-    output_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        with output_path.open("w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as out:
+            out.write("| " + " | ".join(headers) + " |\n")
+            out.write("|" + "|".join(["---"] * len(headers)) + "|\n")
+            for row in rows:
+                out.write("| " + " | ".join(row) + " |\n")
 
 
 def find_csv_files(output_dir: Path, include_candidates: bool) -> Iterable[Path]:
     """Enumerate relevant Part 1–5 CSV outputs if they exist."""
-    files: list[Path] = []
+    if not output_dir.is_dir():
+        return []
+    with os.scandir(output_dir) as entries:
+        present = {entry.name for entry in entries if entry.is_file()}
+
+    names: list[str] = []
     # Parts 1–3
-    files.append(output_dir / "part1_kgrams_jaccard.csv")
-    files.append(output_dir / "part2_minhash_d1_d2.csv")
-    files.append(output_dir / "part3_lsh_probabilities.csv")
+    names.append("part1_kgrams_jaccard.csv")
+    names.append("part2_minhash_d1_d2.csv")
+    names.append("part3_lsh_probabilities.csv")
 
     # Parts 4–5
-    files.append(output_dir / "part4_exact_pairs_ge_0_5.csv")
-    files.append(output_dir / "part4_minhash_summary.csv")
+    names.append("part4_exact_pairs_ge_0_5.csv")
+    names.append("part4_minhash_summary.csv")
 
     for t in config.MOVIELENS_T_VALUES:
-        files.append(output_dir / f"part4_minhash_pairs_t{t}_run1.csv")
+        names.append(f"part4_minhash_pairs_t{t}_run1.csv")
 
     for tau in config.MOVIELENS_LSH_THRESHOLDS:
-        files.append(output_dir / f"part5_lsh_summary_tau_{tau:.1f}.csv")
+        names.append(f"part5_lsh_summary_tau_{tau:.1f}.csv")
         if include_candidates:
-            files.extend(
+            names.extend(
                 sorted(
-                    output_dir.glob(
-                        f"part5_lsh_candidates_tau_{tau:.1f}_t*_r*_b*_run1.csv"
+                    fnmatch.filter(
+                        present, f"part5_lsh_candidates_tau_{tau:.1f}_t*_r*_b*_run1.csv"
                     )
                 )
             )
 
-    return [path for path in files if path.exists()]
+    return [output_dir / name for name in names if name in present]
 
 
 def find_text_files(output_dir: Path) -> list[Path]:
@@ -83,6 +93,59 @@ def find_text_files(output_dir: Path) -> list[Path]:
     return [path for path in candidates if path.exists()]
 
 
+def _bundle_sections(md_files: Sequence[Path], text_files: Sequence[Path]) -> Iterator[str]:
+    """Yield the report sections in order, reading each file lazily.
+
+    Each heading is yielded together with its body, so the last section is
+    never whitespace-only and only it needs trimming.
+    """
+    yield "# Assignment Results"
+
+    for md_path in md_files:
+        title = _TITLE_MAP.get(md_path.name, md_path.stem.replace("_", " ").title())
+        yield f"\n## {title}\n\n" + md_path.read_text(encoding="utf-8").strip()
+
+    if text_files:
+        yield "\n## Notes\n"
+        for text_path in text_files:
+            title = text_path.stem.replace("_", " ").title()
+            yield f"### {title}\n\n" + text_path.read_text(encoding="utf-8").strip()
+
+
+def refresh_markdown_tables(
+    output_dir: Path,
+    csv_files: Sequence[Path],
+    max_rows: int | None,
+) -> None:
+    """Convert CSVs to Markdown, skipping tables that are already current.
+
+    A table is current if it is at least as new as its CSV and was built
+    with the same max_rows (recorded in a small JSON manifest).
+    """
+    manifest_path = output_dir / _MARKDOWN_MANIFEST
+    try:
+        built_rows = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        built_rows = {}
+
+    rebuilt = False
+    for csv_path in csv_files:
+        md_path = csv_path.with_suffix(".md")
+        current = (
+            md_path.exists()
+            and md_path.stat().st_mtime >= csv_path.stat().st_mtime
+            and md_path.name in built_rows
+            and built_rows[md_path.name] == max_rows
+        )
+        if not current:
+            csv_to_markdown(csv_path, md_path, max_rows=max_rows)
+            built_rows[md_path.name] = max_rows
+            rebuilt = True
+
+    if rebuilt:
+        manifest_path.write_text(json.dumps(built_rows, sort_keys=True) + "\n", encoding="utf-8")
+
+
 def bundle_markdown(
     output_dir: Path,
     include_candidates: bool,
@@ -91,31 +154,22 @@ def bundle_markdown(
 ) -> None:
     """Bundle Markdown tables and text blocks into a single report."""
     csv_files = find_csv_files(output_dir, include_candidates=include_candidates)
-    for csv_path in csv_files:
-        md_path = csv_path.with_suffix(".md")
-        if not md_path.exists():
-            csv_to_markdown(csv_path, md_path, max_rows=max_rows)
+    refresh_markdown_tables(output_dir, csv_files, max_rows)
 
     md_files = [path.with_suffix(".md") for path in csv_files]
     text_files = find_text_files(output_dir)
 
-    sections: list[str] = []
-    sections.append("# Assignment Results")
-
-    for md_path in md_files:
-        title = _TITLE_MAP.get(md_path.name, md_path.stem.replace("_", " ").title())
-        sections.append(f"\n## {title}\n")
-        sections.append(md_path.read_text(encoding="utf-8").strip())
-
-    if text_files:
-        sections.append("\n## Notes\n")
-        for text_path in text_files:
-            title = text_path.stem.replace("_", " ").title()
-            sections.append(f"### {title}\n")
-            sections.append(text_path.read_text(encoding="utf-8").strip())
-
+    # Sections are newline-separated; the last one is held back so trailing
+    # whitespace can be trimmed before the closing newline.
     bundle_path = output_dir / bundle_name
-    bundle_path.write_text("\n".join(sections).strip() + "\n", encoding="utf-8")
+    with bundle_path.open("w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as out:
+        sections = _bundle_sections(md_files, text_files)
+        pending = next(sections)
+        for section in sections:
+            out.write(pending)
+            out.write("\n")
+            pending = section
+        out.write(pending.rstrip() + "\n")
 
 
 def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
@@ -162,9 +216,7 @@ def run() -> None:
         print("No Part 4–5 CSV outputs found in:", output_dir)
         return
 
-    for csv_path in csv_files:
-        md_path = csv_path.with_suffix(".md")
-        csv_to_markdown(csv_path, md_path, max_rows=args.max_rows)
+    refresh_markdown_tables(output_dir, csv_files, args.max_rows)
 
     if args.bundle:
         bundle_markdown(
@@ -7,6 +7,8 @@ import re
 from typing import Sequence
 
 _WHITESPACE_RE = re.compile(r"\s+")
+# str's \s also matches the ASCII separators \x1c-\x1f; bytes' \s does not.
+_ASCII_WHITESPACE_RE = re.compile(rb"[\s\x1c-\x1f]+")
 
 
 def normalize_document(text: str) -> str:
@@ -14,7 +16,12 @@ def normalize_document(text: str) -> str:
 
     The assignment states documents contain only lowercase letters and spaces.
     We defensively normalize whitespace to a single space and strip edges.
+    ASCII input (the expected case) is processed as bytes in a single pass.
     """
+    if text.isascii():
+        data = _ASCII_WHITESPACE_RE.sub(b" ", text.encode("ascii").lower())
+        return data.strip(b" ").decode("ascii")
+
     normalized = text.strip().lower()
     normalized = _WHITESPACE_RE.sub(" ", normalized)
     return normalized
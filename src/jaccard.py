@@ -2,10 +2,18 @@
 
 from __future__ import annotations
 
-from typing import AbstractSet, TypeVar
+from typing import AbstractSet, Hashable, Sequence, TypeVar
+
+import numpy as np
 
 T = TypeVar("T")
 
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+# Integer items below this are used as bit positions without a vocabulary
+# (8 KiB per bitset at most).
+_MAX_DIRECT_BITMAP_ID = 1 << 16
+
 
 def jaccard_similarity(a: AbstractSet[T], b: AbstractSet[T]) -> float:
     """Compute Jaccard similarity between two sets.
@@ -18,3 +26,115 @@ def jaccard_similarity(a: AbstractSet[T], b: AbstractSet[T]) -> float:
     if not union:
         return 0.0
     return len(a & b) / len(union)
+
+
+def _popcount_rows(words: np.ndarray) -> np.ndarray:
+    """Count set bits along the last axis of a uint64 array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    return _POPCOUNT_TABLE[words.view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+
+def pack_bitsets(sets: Sequence[AbstractSet[Hashable] | np.ndarray]) -> np.ndarray:
+    """Pack sets over a shared vocabulary into rows of uint64 bit words.
+
+    Sets may also be given as arrays of unique items. Small non-negative
+    integer items are used as bit positions directly; anything else is
+    mapped to columns with np.unique/np.searchsorted.
+    """
+    if sets and all(isinstance(items, np.ndarray) for items in sets):
+        lengths = np.fromiter(map(len, sets), dtype=np.int64, count=len(sets))
+        flat = np.concatenate(sets)
+        if (
+            flat.size
+            and np.issubdtype(flat.dtype, np.integer)
+            and flat.min() >= 0
+            and flat.max() < _MAX_DIRECT_BITMAP_ID
+        ):
+            # Small non-negative ids (e.g. MovieLens movie ids) index bits directly
+            columns = flat.astype(np.int64, copy=False)
+            width = int(columns.max()) + 1
+        else:
+            vocab_array = np.unique(flat)
+            columns = np.searchsorted(vocab_array, flat)
+            width = len(vocab_array)
+        num_words = max(1, (width + 63) // 64)
+        bits = np.zeros((len(sets), num_words * 64), dtype=bool)
+        bits[np.repeat(np.arange(len(sets)), lengths), columns] = True
+        return np.packbits(bits, axis=1).view(np.uint64)
+
+    vocab = {item: index for index, item in enumerate(set().union(*sets))}
+    num_words = max(1, (len(vocab) + 63) // 64)
+    bits = np.zeros((len(sets), num_words * 64), dtype=bool)
+    for row, items in enumerate(sets):
+        columns = np.fromiter(
+            (vocab[item] for item in items), dtype=np.int64, count=len(items)
+        )
+        bits[row, columns] = True
+    return np.packbits(bits, axis=1).view(np.uint64)
+
+
+def jaccard_all_pairs(
+    sets: Sequence[AbstractSet[Hashable] | np.ndarray],
+    threshold: float | None = None,
+) -> np.ndarray:
+    """Compute the symmetric (n, n) Jaccard matrix for a list of sets.
+
+    Each set is packed into a bitset over the shared vocabulary so that
+    intersections are word-wide ANDs followed by a popcount. Follows the
+    same convention as jaccard_similarity: two empty sets have similarity 1.0.
+
+    If threshold is given, pairs whose size ratio min/max is below it
+    (an upper bound on their Jaccard) are skipped and left at 0.0, so only
+    entries >= threshold are guaranteed exact.
+    """
+    num_sets = len(sets)
+    bitsets = pack_bitsets(sets)
+    sizes = _popcount_rows(bitsets)
+    if threshold is not None and threshold > 0:
+        return _jaccard_all_pairs_pruned(bitsets, sizes, threshold)
+
+    result = np.ones((num_sets, num_sets), dtype=np.float64)
+    for i in range(num_sets - 1):
+        inter = _popcount_rows(bitsets[i] & bitsets[i + 1 :])
+        union = sizes[i] + sizes[i + 1 :] - inter
+        sims = np.divide(inter, union, out=np.ones(len(inter)), where=union > 0)
+        result[i, i + 1 :] = sims
+        result[i + 1 :, i] = sims
+    return result
+
+
+def _jaccard_all_pairs_pruned(
+    bitsets: np.ndarray,
+    sizes: np.ndarray,
+    threshold: float,
+) -> np.ndarray:
+    """Jaccard matrix that only compares sets whose sizes allow J >= threshold.
+
+    With sets ordered by size, J(A, B) <= |A| / |B| for |A| <= |B|, so each
+    set only needs comparing against the contiguous run of larger sets up
+    to |A| / threshold.
+    """
+    num_sets = len(sizes)
+    order = np.argsort(sizes, kind="stable")
+    sorted_bitsets = bitsets[order]
+    sorted_sizes = sizes[order]
+    # Slightly widen the bound so float rounding never prunes a J == threshold pair
+    limits = np.searchsorted(
+        sorted_sizes, sorted_sizes / threshold * (1 + 1e-9), side="right"
+    )
+
+    result = np.zeros((num_sets, num_sets), dtype=np.float64)
+    np.fill_diagonal(result, 1.0)
+    for pos in range(num_sets - 1):
+        stop = limits[pos]
+        if stop <= pos + 1:
+            continue
+        inter = _popcount_rows(sorted_bitsets[pos] & sorted_bitsets[pos + 1 : stop])
+        union = sorted_sizes[pos] + sorted_sizes[pos + 1 : stop] - inter
+        sims = np.divide(inter, union, out=np.ones(len(inter)), where=union > 0)
+        i = order[pos]
+        others = order[pos + 1 : stop]
+        result[i, others] = sims
+        result[others, i] = sims
+    return result
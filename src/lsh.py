@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable
+from functools import lru_cache
+
+import numpy as np
 
 
 @dataclass(frozen=True)
@@ -18,29 +20,38 @@ class LshParams:
     b: int
 
 
+def lsh_probability_vec(similarities: np.ndarray, r: int, b: int) -> np.ndarray:
+    """Compute f(s) = 1 - (1 - s^b)^r elementwise over an array of similarities."""
+    sims = np.asarray(similarities, dtype=np.float64)
+    if np.any((sims < 0.0) | (sims > 1.0)):
+        raise ValueError("similarity must be in [0, 1]")
+    return 1.0 - np.power(1.0 - np.power(sims, b), r)
+
+
+def lsh_slope_vec(similarities: np.ndarray, r: int, b: int) -> np.ndarray:
+    """Derivative of f(s) elementwise; 0 outside the open interval (0, 1)."""
+    sims = np.asarray(similarities, dtype=np.float64)
+    slopes = r * b * np.power(sims, b - 1) * np.power(1.0 - np.power(sims, b), r - 1)
+    return np.where((sims > 0.0) & (sims < 1.0), slopes, 0.0)
+
+
 def lsh_probability(similarity: float, r: int, b: int) -> float:
     """Compute LSH candidate probability f(s) = 1 - (1 - s^b)^r."""
-    if similarity < 0.0 or similarity > 1.0:
-        raise ValueError("similarity must be in [0, 1]")
-    return 1.0 - (1.0 - similarity**b) ** r
+    return float(lsh_probability_vec(np.array([similarity]), r, b)[0])
 
 
 def lsh_slope(similarity: float, r: int, b: int) -> float:
     """Derivative of f(s) at a given similarity value."""
-    if similarity <= 0.0:
-        return 0.0
-    if similarity >= 1.0:
-        return 0.0
-    return r * b * (similarity ** (b - 1)) * ((1.0 - similarity**b) ** (r - 1))
+    return float(lsh_slope_vec(np.array([similarity]), r, b)[0])
 
 
-def factor_pairs(n: int) -> Iterable[tuple[int, int]]:
-    """Yield (r, b) pairs such that r * b = n."""
-    for r in range(1, n + 1):
-        if n % r == 0:
-            yield (r, n // r)
+@lru_cache(maxsize=None)
+def factor_pairs(n: int) -> tuple[tuple[int, int], ...]:
+    """Return all (r, b) pairs such that r * b = n."""
+    return tuple((r, n // r) for r in range(1, n + 1) if n % r == 0)
 
 
+@lru_cache(maxsize=None)
 def choose_lsh_params(t: int, tau: float) -> LshParams:
     """Choose (r, b) with good separation at tau.
 
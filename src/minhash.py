@@ -3,12 +3,25 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 import hashlib
 import random
-from typing import Iterable, Sequence
+from typing import AbstractSet, Iterable, Sequence
+
+import numpy as np
 
 PRIME: int = 4_294_967_311  # largest 32-bit prime
 
+# Largest item for which a*x + b (a, b < PRIME < 2**33) cannot overflow uint64.
+_MAX_VECTORIZED_ITEM: int = 2**31
+
+# Max hash values computed at once by the batched kernel (~1M keeps each
+# tile's working set small and bounds temporaries).
+_TILE_ELEMENTS: int = 1 << 20
+
+# Cap on memoized token hashes (tokens repeat across documents and t values).
+_TOKEN_CACHE_SIZE: int = 1 << 18
+
 
 @dataclass(frozen=True)
 class HashFunction:
@@ -34,27 +47,69 @@ def generate_hash_functions(count: int, seed: int) -> list[HashFunction]:
     return functions
 
 
+@lru_cache(maxsize=_TOKEN_CACHE_SIZE)
 def hash_token(token: str) -> int:
     """Hash a token deterministically to an integer."""
     digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
     return int.from_bytes(digest, "big", signed=False)
 
 
+def hash_tokens(tokens: Iterable[str]) -> np.ndarray:
+    """Hash tokens to a uint64 array in one pass."""
+    return np.fromiter((hash_token(token) for token in tokens), dtype=np.uint64)
+
+
+def _mod_inplace(values: np.ndarray, modulus: np.uint64) -> np.ndarray:
+    """Reduce a uint64 array mod a scalar in place and return it.
+
+    NumPy's floor division by a scalar uses a multiply-and-shift divisor
+    (libdivide), while ``%`` issues a hardware divide per element, so
+    x - (x // d) * d is about twice as fast as x % d and exactly equal.
+    """
+    quotient = values // modulus
+    quotient *= modulus
+    values -= quotient
+    return values
+
+
+def _linear_hashes(a_arr: np.ndarray, b_arr: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """Compute (a*x + b) % PRIME as a (t, |x|) uint64 matrix, exactly.
+
+    Small items are hashed directly. Larger ones (e.g. 64-bit token hashes)
+    are reduced mod PRIME and multiplied in 16-bit halves so that no
+    intermediate product overflows uint64. Work is done in place on a
+    single output buffer.
+    """
+    prime = np.uint64(PRIME)
+    a_col = a_arr[:, None]
+    b_col = b_arr[:, None]
+    if x.max() < _MAX_VECTORIZED_ITEM:
+        out = np.multiply(a_col, x[None, :])
+        out += b_col
+        return _mod_inplace(out, prime)
+
+    x = _mod_inplace(x.copy(), prime)
+    out = np.multiply(a_col, (x >> np.uint64(16))[None, :])
+    _mod_inplace(out, prime)
+    out <<= np.uint64(16)
+    out += a_col * (x & np.uint64(0xFFFF))[None, :]
+    out += b_col
+    return _mod_inplace(out, prime)
+
+
 def minhash_signature(
     tokens: Iterable[str],
     hash_functions: Sequence[HashFunction],
     m: int,
 ) -> list[int]:
     """Compute the MinHash signature for a set of tokens."""
-    token_hashes = [hash_token(token) for token in tokens]
-    if not token_hashes:
+    token_hashes = hash_tokens(tokens)
+    if token_hashes.size == 0:
         return [m] * len(hash_functions)
 
-    signature: list[int] = []
-    for func in hash_functions:
-        min_value = min(func.apply(h, m) for h in token_hashes)
-        signature.append(min_value)
-    return signature
+    a_arr, b_arr = hash_function_arrays(hash_functions)
+    hashes = _mod_inplace(_linear_hashes(a_arr, b_arr, token_hashes), np.uint64(m))
+    return hashes.min(axis=1).tolist()
 
 
 def minhash_signature_from_ints(
@@ -74,18 +129,134 @@ def minhash_signature_from_ints(
     return signature
 
 
+def hash_function_arrays(
+    hash_functions: Sequence[HashFunction],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the (a, b) coefficients of hash functions as uint64 arrays."""
+    if any(func.prime != PRIME for func in hash_functions):
+        raise ValueError("Vectorized MinHash requires hash functions mod PRIME")
+    count = len(hash_functions)
+    a_arr = np.fromiter((func.a for func in hash_functions), dtype=np.uint64, count=count)
+    b_arr = np.fromiter((func.b for func in hash_functions), dtype=np.uint64, count=count)
+    return a_arr, b_arr
+
+
+def minhash_signatures_batched(
+    items_flat: np.ndarray,
+    offsets: np.ndarray,
+    a_arr: np.ndarray,
+    b_arr: np.ndarray,
+    m: int,
+) -> np.ndarray:
+    """Compute signatures for ragged item sets stored back to back.
+
+    Set i occupies items_flat[offsets[i] : offsets[i + 1]]. Consecutive sets
+    are hashed together in tiles of at most _TILE_ELEMENTS hash values, and
+    each set's minimum is taken with np.minimum.reduceat. Empty sets get m.
+    Returns a (num_sets, t) uint32 array.
+    """
+    t = len(a_arr)
+    signatures = np.full((len(offsets) - 1, t), m, dtype=np.uint32)
+    nonempty = np.flatnonzero(np.diff(offsets))
+    if nonempty.size == 0 or t == 0:
+        return signatures
+
+    # Cumulative item counts at the end of each non-empty set
+    ends = offsets[nonempty + 1]
+    items_per_tile = max(1, _TILE_ELEMENTS // t)
+    m_u64 = np.uint64(m)
+
+    first = 0
+    while first < len(nonempty):
+        tile_start = offsets[nonempty[first]]
+        last = np.searchsorted(ends, tile_start + items_per_tile, side="right")
+        last = max(int(last), first + 1)
+        rows = nonempty[first:last]
+        hashes = _linear_hashes(a_arr, b_arr, items_flat[tile_start : ends[last - 1]])
+        _mod_inplace(hashes, m_u64)
+        segment_starts = offsets[rows] - tile_start
+        signatures[rows] = np.minimum.reduceat(hashes, segment_starts, axis=1).T
+        first = last
+    return signatures
+
+
+def _item_array(items: AbstractSet[int] | np.ndarray) -> np.ndarray | None:
+    """Return items as a uint64 array, or None if they cannot be represented."""
+    if isinstance(items, np.ndarray):
+        if items.size and items.min() < 0:
+            return None
+        return items.astype(np.uint64)
+    if items and (min(items) < 0 or max(items) >= 2**64):
+        return None
+    return np.fromiter(items, dtype=np.uint64, count=len(items))
+
+
 def minhash_signatures_for_sets(
-    item_sets: Sequence[set[int]],
+    item_sets: Sequence[AbstractSet[int] | np.ndarray],
     hash_functions: Sequence[HashFunction],
     m: int,
-) -> list[list[int]]:
-    """Compute MinHash signatures for multiple item sets."""
-    signatures: list[list[int]] = []
-    for items in item_sets:
-        signatures.append(minhash_signature_from_ints(items, hash_functions, m))
+) -> np.ndarray:
+    """Compute MinHash signatures for multiple item sets (or unique-item arrays).
+
+    Returns a (num_sets, t) uint32 array. All sets go through one batched
+    call of minhash_signatures_batched; sets with negative or beyond-uint64
+    items fall back to minhash_signature_from_ints.
+    """
+    a_arr, b_arr = hash_function_arrays(hash_functions)
+    signatures = np.empty((len(item_sets), len(hash_functions)), dtype=np.uint32)
+
+    batched_rows: list[int] = []
+    batched_items: list[np.ndarray] = []
+    for row, items in enumerate(item_sets):
+        item_array = _item_array(items)
+        if item_array is not None:
+            batched_rows.append(row)
+            batched_items.append(item_array)
+        else:
+            if isinstance(items, np.ndarray):
+                items = items.tolist()
+            signatures[row] = minhash_signature_from_ints(items, hash_functions, m)
+
+    lengths = np.fromiter(map(len, batched_items), dtype=np.int64, count=len(batched_items))
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    items_flat = (
+        np.concatenate(batched_items) if batched_items else np.empty(0, dtype=np.uint64)
+    )
+    signatures[batched_rows] = minhash_signatures_batched(
+        items_flat, offsets, a_arr, b_arr, m
+    )
     return signatures
 
 
+def minhash_signatures_for_token_sets(
+    token_sets: Sequence[Iterable[str]],
+    hash_functions: Sequence[HashFunction],
+    m: int,
+) -> np.ndarray:
+    """Compute MinHash signatures for several token sets in one batched call.
+
+    Row i equals minhash_signature(token_sets[i], hash_functions, m).
+    Returns a (num_sets, t) uint32 array.
+    """
+    a_arr, b_arr = hash_function_arrays(hash_functions)
+    hashed = [hash_tokens(tokens) for tokens in token_sets]
+    lengths = np.fromiter(map(len, hashed), dtype=np.int64, count=len(hashed))
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    items_flat = np.concatenate(hashed) if hashed else np.empty(0, dtype=np.uint64)
+    return minhash_signatures_batched(items_flat, offsets, a_arr, b_arr, m)
+
+
+def signature_dtype(m: int) -> np.dtype:
+    """Return the narrowest unsigned dtype that holds signature values in [0, m].
+
+    m itself must fit, since it is the signature value for an empty set.
+    """
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if m <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    raise ValueError(f"m={m} does not fit in a uint32 signature")
+
+
 def estimate_jaccard_from_signatures(sig_a: Sequence[int], sig_b: Sequence[int]) -> float:
     """Estimate Jaccard similarity from two signatures."""
     if len(sig_a) != len(sig_b):
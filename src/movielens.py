@@ -3,7 +3,10 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Iterable
+from typing import Collection, Iterable, Mapping
+import warnings
+
+import numpy as np
 
 
 def _resolve_ratings_path(path: Path) -> Path:
@@ -18,13 +21,8 @@ def _resolve_ratings_path(path: Path) -> Path:
     raise FileNotFoundError(f"Ratings file not found: {path}")
 
 
-def load_user_movie_sets(ratings_path: Path) -> dict[int, set[int]]:
-    """Load MovieLens ratings and return user -> set of movie IDs.
-
-    Expected format: tab-separated with columns user_id, movie_id, rating, timestamp.
-    Only user_id and movie_id are used.
-    """
-    resolved = _resolve_ratings_path(ratings_path)
+def _parse_user_movie_lines(resolved: Path) -> dict[int, set[int]]:
+    """Parse ratings line by line, skipping blank or short lines."""
     user_movies: dict[int, set[int]] = {}
     with resolved.open("r", encoding="utf-8") as handle:
         for line in handle:
@@ -40,12 +38,76 @@ def load_user_movie_sets(ratings_path: Path) -> dict[int, set[int]]:
     return user_movies
 
 
-def sorted_user_ids(user_movies: dict[int, set[int]]) -> list[int]:
+def _read_ratings_array(resolved: Path) -> np.ndarray | None:
+    """Read (user_id, movie_id) columns in bulk, or None for irregular files."""
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)  # empty-file warning
+            return np.loadtxt(
+                resolved,
+                delimiter="\t",
+                comments=None,
+                usecols=(0, 1),
+                dtype=np.int64,
+                ndmin=2,
+                encoding="utf-8",
+            )
+    except ValueError:
+        return None
+
+
+def load_user_movie_arrays(ratings_path: Path) -> dict[int, np.ndarray]:
+    """Load MovieLens ratings and return user -> sorted unique movie ID array.
+
+    Expected format: tab-separated with columns user_id, movie_id, rating, timestamp.
+    Only user_id and movie_id are used. Well-formed files are read in bulk
+    with NumPy's C parser and grouped by a single sort; files with short
+    rows fall back to a line-by-line parser that skips them. Arrays are
+    int32 when the IDs fit, and are views into one contiguous buffer.
+    """
+    resolved = _resolve_ratings_path(ratings_path)
+    ratings = _read_ratings_array(resolved)
+    if ratings is None:
+        user_sets = _parse_user_movie_lines(resolved)
+        return {
+            user_id: np.array(sorted(movies), dtype=np.int64)
+            for user_id, movies in user_sets.items()
+        }
+    if ratings.size == 0:
+        return {}
+
+    order = np.lexsort((ratings[:, 1], ratings[:, 0]))
+    users = ratings[order, 0]
+    movies = ratings[order, 1]
+    # Drop repeated (user, movie) ratings so each array is a set
+    keep = np.ones(len(users), dtype=bool)
+    keep[1:] = (np.diff(users) != 0) | (np.diff(movies) != 0)
+    users = users[keep]
+    movies = movies[keep]
+
+    int32_info = np.iinfo(np.int32)
+    if int32_info.min <= movies.min() and movies.max() <= int32_info.max:
+        movies = movies.astype(np.int32)
+
+    boundaries = np.flatnonzero(np.diff(users)) + 1
+    starts = [0, *boundaries.tolist()]
+    return dict(zip(users[starts].tolist(), np.split(movies, boundaries)))
+
+
+def load_user_movie_sets(ratings_path: Path) -> dict[int, set[int]]:
+    """Load MovieLens ratings and return user -> set of movie IDs."""
+    return {
+        user_id: set(movies.tolist())
+        for user_id, movies in load_user_movie_arrays(ratings_path).items()
+    }
+
+
+def sorted_user_ids(user_movies: Mapping[int, Collection[int]]) -> list[int]:
     """Return user IDs in sorted order."""
     return sorted(user_movies.keys())
 
 
-def iter_user_sets(user_movies: dict[int, set[int]]) -> Iterable[set[int]]:
-    """Yield user movie sets in sorted user id order."""
+def iter_user_sets(user_movies: Mapping[int, Collection[int]]) -> Iterable[Collection[int]]:
+    """Yield user movie sets (or arrays) in sorted user id order."""
     for user_id in sorted_user_ids(user_movies):
         yield user_movies[user_id]
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from itertools import combinations
-from typing import Iterable
+from typing import AbstractSet, Iterable, Iterator
 
 import numpy as np
 
@@ -12,6 +12,11 @@ from . import lsh as lsh_lib
 from . import minhash as minhash_lib
 
 Pair = tuple[int, int]
+# Parallel (user_a, user_b, similarity) arrays, one entry per pair
+PairArrays = tuple[np.ndarray, np.ndarray, np.ndarray]
+
+# Users per block when comparing signatures (bounds the block x N counter).
+_PAIR_BLOCK_ROWS = 256
 
 
 def iter_pairs(user_ids: list[int]) -> Iterable[Pair]:
@@ -19,36 +24,151 @@ def iter_pairs(user_ids: list[int]) -> Iterable[Pair]:
     return combinations(user_ids, 2)
 
 
+def pair_indices(n: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return index arrays (i, j) of all pairs i < j, in iter_pairs order."""
+    return np.triu_indices(n, k=1)
+
+
 def compute_exact_jaccard(
     user_ids: list[int],
-    user_sets: list[set[int]],
-) -> dict[Pair, float]:
-    """Compute exact Jaccard for all user pairs."""
-    results: dict[Pair, float] = {}
-    for i, j in combinations(range(len(user_ids)), 2):
-        pair = (user_ids[i], user_ids[j])
-        results[pair] = jaccard_lib.jaccard_similarity(user_sets[i], user_sets[j])
-    return results
+    user_sets: list[np.ndarray],
+    threshold: float | None = None,
+) -> np.ndarray:
+    """Compute exact Jaccard for all user pairs.
+
+    user_sets holds each user's sorted unique movie IDs, as returned by
+    movielens.load_user_movie_arrays (Python sets are also accepted).
+    Returns a dense (num_users, num_users) matrix indexed like user_ids;
+    only entries above the diagonal (i < j) are meaningful as pairs.
+
+    If threshold is given, pairs that cannot reach it by set size are
+    pruned (left at 0.0); leave it as None to get every value.
+    """
+    if len(user_ids) != len(user_sets):
+        raise ValueError("user_ids and user_sets must have the same length")
+    return jaccard_lib.jaccard_all_pairs(user_sets, threshold=threshold)
+
+
+def compute_exact_jaccard_arrays(
+    user_ids: list[int],
+    user_sets: list[np.ndarray],
+    threshold: float | None = None,
+) -> PairArrays:
+    """Compute exact Jaccard as parallel (user_a, user_b, similarity) arrays.
+
+    Covers all pairs i < j in row-major order, or only those with
+    similarity >= threshold if one is given.
+    """
+    matrix = compute_exact_jaccard(user_ids, user_sets, threshold=threshold)
+    return matrix_pair_arrays(user_ids, matrix, threshold)
 
 
 def pairs_above_threshold(
-    similarities: dict[Pair, float],
+    similarities: dict[Pair, float] | PairArrays,
     threshold: float,
 ) -> set[Pair]:
-    """Return all pairs with similarity >= threshold."""
-    return {pair for pair, sim in similarities.items() if sim >= threshold}
+    """Return all pairs with similarity >= threshold.
+
+    Accepts either a {pair: similarity} dict or (user_a, user_b, similarity)
+    arrays, which are filtered with a single mask.
+    """
+    if isinstance(similarities, dict):
+        return {pair for pair, sim in similarities.items() if sim >= threshold}
+    user_a, user_b, sims = similarities
+    mask = sims >= threshold
+    return set(zip(user_a[mask].tolist(), user_b[mask].tolist()))
+
+
+def matrix_pair_arrays(
+    user_ids: list[int],
+    matrix: np.ndarray,
+    threshold: float | None = None,
+) -> PairArrays:
+    """Return (user_a, user_b, similarity) arrays for pairs i < j of a matrix.
+
+    If threshold is given, only entries >= threshold are kept. Pairs are in
+    row-major order, matching iter_pairs(user_ids).
+    """
+    rows, cols = pair_indices(len(user_ids))
+    sims = matrix[rows, cols]
+    if threshold is not None:
+        keep = sims >= threshold
+        rows, cols, sims = rows[keep], cols[keep], sims[keep]
+    ids = np.asarray(user_ids)
+    return ids[rows], ids[cols], sims
+
+
+def pair_keys(pair_arrays: PairArrays) -> frozenset[Pair]:
+    """Return the (user_a, user_b) pairs of pair arrays as a frozenset."""
+    user_a, user_b, _ = pair_arrays
+    return frozenset(zip(user_a.tolist(), user_b.tolist()))
+
+
+def pair_arrays_to_dict(pair_arrays: PairArrays) -> dict[Pair, float]:
+    """Convert (user_a, user_b, similarity) arrays to a {pair: similarity} dict."""
+    user_a, user_b, sims = pair_arrays
+    return dict(zip(zip(user_a.tolist(), user_b.tolist()), sims.tolist()))
 
 
 def minhash_signatures_matrix(
-    user_sets: list[set[int]],
+    user_sets: list[np.ndarray],
     t: int,
     m: int,
     seed: int,
 ) -> np.ndarray:
-    """Compute a MinHash signature matrix of shape (num_users, t)."""
+    """Compute a MinHash signature matrix of shape (num_users, t).
+
+    The matrix uses the narrowest unsigned dtype that holds values up to m
+    (uint16 for the default m), which shrinks the memory-bound pair
+    comparisons and LSH banding.
+    """
     hash_functions = minhash_lib.generate_hash_functions(t, seed)
     signatures = minhash_lib.minhash_signatures_for_sets(user_sets, hash_functions, m)
-    return np.array(signatures, dtype=np.uint32)
+    return signatures.astype(minhash_lib.signature_dtype(m), copy=False)
+
+
+def _iter_estimated_pair_blocks(
+    signatures: np.ndarray,
+    threshold: float,
+) -> Iterator[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Yield (i, j, estimate) arrays for pairs whose estimate is >= threshold.
+
+    Users are processed in blocks of _PAIR_BLOCK_ROWS against all later
+    users. Matches are accumulated one signature position at a time into a
+    narrow (block, N) counter, so no (block, N, t) temporary is built and
+    each step reads one contiguous column. Pairs come out in row-major
+    (i < j) order across blocks.
+    """
+    num_users, t = signatures.shape
+    if t == 0:
+        return
+
+    columns = np.ascontiguousarray(signatures.T)
+    count_dtype = np.uint16 if t <= np.iinfo(np.uint16).max else np.uint32
+    for start in range(0, num_users, _PAIR_BLOCK_ROWS):
+        stop = min(start + _PAIR_BLOCK_ROWS, num_users)
+        matches = np.zeros((stop - start, num_users - start), dtype=count_dtype)
+        for column in columns:
+            matches += column[start:stop, None] == column[None, start:]
+        sims = matches / t
+        # Column c of the block is user start + c; keep only c > row (j > i)
+        rows, cols = np.nonzero(np.triu(sims >= threshold, k=1))
+        yield rows + start, cols + start, sims[rows, cols]
+
+
+def estimated_pair_arrays(
+    user_ids: list[int],
+    signatures: np.ndarray,
+    threshold: float,
+) -> PairArrays:
+    """Estimate Jaccard for all pairs and return those >= threshold as arrays."""
+    blocks = list(_iter_estimated_pair_blocks(signatures, threshold))
+    if not blocks:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0, dtype=np.float64)
+    rows, cols, sims = (np.concatenate(parts) for parts in zip(*blocks))
+    ids = np.asarray(user_ids)
+    return ids[rows], ids[cols], sims
 
 
 def estimated_pairs_from_signatures(
@@ -57,50 +177,74 @@ def estimated_pairs_from_signatures(
     threshold: float,
 ) -> dict[Pair, float]:
     """Estimate Jaccard for all pairs and return those >= threshold."""
-    num_users, t = signatures.shape
-    results: dict[Pair, float] = {}
-
-    for i in range(num_users):
-        sig_i = signatures[i]
-        for j in range(i + 1, num_users):
-            sim = float(np.mean(sig_i == signatures[j]))
-            if sim >= threshold:
-                results[(user_ids[i], user_ids[j])] = sim
-    return results
+    return pair_arrays_to_dict(estimated_pair_arrays(user_ids, signatures, threshold))
 
 
-def lsh_candidate_pairs(
+def estimated_pairs_keys_from_signatures(
     user_ids: list[int],
+    signatures: np.ndarray,
+    threshold: float,
+) -> frozenset[Pair]:
+    """Return only the pairs whose estimated Jaccard is >= threshold."""
+    return pair_keys(estimated_pair_arrays(user_ids, signatures, threshold))
+
+
+def _lsh_candidate_indices(
     signatures: np.ndarray,
     params: lsh_lib.LshParams,
-) -> set[Pair]:
-    """Compute LSH candidate pairs for given signatures and parameters."""
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return row-index arrays (i, j), i < j, of distinct LSH candidate pairs.
+
+    Pairs are sorted in row-major order.
+    """
     num_users, t = signatures.shape
     if params.r * params.b != t:
         raise ValueError("LSH params r*b must equal signature length")
 
-    candidates: set[Pair] = set()
+    empty = np.empty(0, dtype=np.int64)
+    if num_users < 2:
+        return empty, empty
+
+    # Each pair (i, j) is encoded as i * num_users + j so duplicates across
+    # bands collapse in a single np.unique.
+    pair_codes: list[np.ndarray] = []
     for band_index in range(params.r):
         start = band_index * params.b
         end = start + params.b
-        buckets: dict[tuple[int, ...], list[int]] = {}
-        for i in range(num_users):
-            key = tuple(signatures[i, start:end].tolist())
-            buckets.setdefault(key, []).append(i)
+        # Group users with identical band rows in one sort: users sharing a
+        # bucket get the same inverse label and become contiguous in `order`.
+        _, inverse = np.unique(signatures[:, start:end], axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        order = np.argsort(inverse, kind="stable")
+        boundaries = np.flatnonzero(np.diff(inverse[order])) + 1
+        bucket_starts = np.concatenate(([0], boundaries))
+        bucket_ends = np.concatenate((boundaries, [num_users]))
+
+        for bucket in np.flatnonzero(bucket_ends - bucket_starts >= 2):
+            # Stable sort keeps members ascending, so first < second
+            members = order[bucket_starts[bucket] : bucket_ends[bucket]].astype(np.int64)
+            first, second = pair_indices(len(members))
+            pair_codes.append(members[first] * num_users + members[second])
+
+    if not pair_codes:
+        return empty, empty
+    return np.divmod(np.unique(np.concatenate(pair_codes)), num_users)
 
-        for bucket_indices in buckets.values():
-            if len(bucket_indices) < 2:
-                continue
-            for a, b in combinations(bucket_indices, 2):
-                pair = (user_ids[a], user_ids[b])
-                candidates.add(pair)
 
-    return candidates
+def lsh_candidate_pairs(
+    user_ids: list[int],
+    signatures: np.ndarray,
+    params: lsh_lib.LshParams,
+) -> set[Pair]:
+    """Compute LSH candidate pairs for given signatures and parameters."""
+    rows, cols = _lsh_candidate_indices(signatures, params)
+    ids = np.asarray(user_ids)
+    return set(zip(ids[rows].tolist(), ids[cols].tolist()))
 
 
 def compute_fp_fn(
-    predicted_pairs: set[Pair],
-    true_pairs: set[Pair],
+    predicted_pairs: AbstractSet[Pair],
+    true_pairs: AbstractSet[Pair],
 ) -> tuple[int, int]:
     """Compute false positives and false negatives given predicted/true pairs."""
     false_positives = len(predicted_pairs - true_pairs)
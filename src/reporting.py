@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 from itertools import combinations
 from typing import Sequence
 
+import numpy as np
+
 from . import jaccard as jaccard_lib
 from . import kgrams as kgrams_lib
 from . import lsh as lsh_lib
@@ -21,23 +24,64 @@ def pairwise_ids(doc_ids: Sequence[str]) -> list[Pair]:
 
 def compute_pairwise_jaccard(grams_by_doc: dict[str, set[str]]) -> dict[Pair, float]:
     """Compute Jaccard similarities for all doc pairs."""
-    doc_ids = sorted(grams_by_doc.keys())
+    doc_ids = sorted(grams_by_doc)
+    gram_list = [grams_by_doc[doc_id] for doc_id in doc_ids]
     results: dict[Pair, float] = {}
-    for a, b in pairwise_ids(doc_ids):
-        results[(a, b)] = jaccard_lib.jaccard_similarity(grams_by_doc[a], grams_by_doc[b])
+    for i, j in combinations(range(len(doc_ids)), 2):
+        results[(doc_ids[i], doc_ids[j])] = jaccard_lib.jaccard_similarity(
+            gram_list[i], gram_list[j]
+        )
     return results
 
 
+def _kgram_jaccards_for_spec(
+    documents: dict[str, str],
+    mode: str,
+    k: int,
+) -> tuple[dict[Pair, float], dict[str, set[str]]]:
+    """Build k-grams for one spec and compute their pairwise Jaccard values."""
+    grams_by_doc = kgrams_lib.build_kgrams_for_documents(documents, mode, k)
+    return compute_pairwise_jaccard(grams_by_doc), grams_by_doc
+
+
+def compute_kgram_jaccards_with_grams(
+    documents: dict[str, str],
+    specs: Sequence[tuple[str, int]],
+    workers: int | None = 1,
+) -> tuple[dict[str, dict[Pair, float]], dict[str, dict[str, set[str]]]]:
+    """Compute pairwise Jaccard values for each k-gram spec.
+
+    Also returns the k-grams built per spec (keyed like the Jaccard output,
+    e.g. "char_3") so callers can reuse them instead of rebuilding. Specs
+    are independent, so with workers other than 1 (None for CPU count) and
+    more than one spec they run in a process pool.
+    """
+    keys = [f"{mode}_{k}" for mode, k in specs]
+    if workers == 1 or len(specs) <= 1:
+        results = [_kgram_jaccards_for_spec(documents, mode, k) for mode, k in specs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_kgram_jaccards_for_spec, documents, mode, k)
+                for mode, k in specs
+            ]
+            results = [future.result() for future in futures]
+
+    output: dict[str, dict[Pair, float]] = {}
+    grams_by_spec: dict[str, dict[str, set[str]]] = {}
+    for key, (jaccards, grams_by_doc) in zip(keys, results):
+        output[key] = jaccards
+        grams_by_spec[key] = grams_by_doc
+    return output, grams_by_spec
+
+
 def compute_kgram_jaccards(
     documents: dict[str, str],
     specs: Sequence[tuple[str, int]],
+    workers: int | None = 1,
 ) -> dict[str, dict[Pair, float]]:
     """Compute pairwise Jaccard values for each k-gram spec."""
-    output: dict[str, dict[Pair, float]] = {}
-    for mode, k in specs:
-        key = f"{mode}_{k}"
-        grams_by_doc = kgrams_lib.build_kgrams_for_documents(documents, mode, k)
-        output[key] = compute_pairwise_jaccard(grams_by_doc)
+    output, _ = compute_kgram_jaccards_with_grams(documents, specs, workers)
     return output
 
 
@@ -50,9 +94,16 @@ def compute_minhash_estimates(
 ) -> list[dict[str, float]]:
     """Compute MinHash estimates for each t and include errors."""
     exact = jaccard_lib.jaccard_similarity(grams_d1, grams_d2)
+    # Hash functions for smaller t are prefixes of those for the largest t,
+    # so both documents are hashed once and each t reads a signature prefix.
+    all_hash_functions = minhash_lib.generate_hash_functions(max(t_values, default=0), seed)
+    sig_d1, sig_d2 = minhash_lib.minhash_signatures_for_token_sets(
+        [grams_d1, grams_d2], all_hash_functions, m
+    )
+    cumulative_matches = np.concatenate(([0], np.cumsum(sig_d1 == sig_d2)))
     rows: list[dict[str, float]] = []
     for t in t_values:
-        estimate = minhash_lib.approximate_jaccard(grams_d1, grams_d2, t=t, m=m, seed=seed)
+        estimate = float(cumulative_matches[t]) / t if t else 1.0
         rows.append(
             {
                 "t": float(t),
@@ -73,14 +124,17 @@ def recommend_t(rows: Sequence[dict[str, float]]) -> int:
         raise ValueError("No rows to analyze")
 
     sorted_rows = sorted(rows, key=lambda r: r["t"])
-    errors = [row["abs_error"] for row in sorted_rows]
-    ts = [int(row["t"]) for row in sorted_rows]
+    count = len(sorted_rows)
+    ts = np.fromiter((row["t"] for row in sorted_rows), dtype=np.int64, count=count)
+    errors = np.fromiter(
+        (row["abs_error"] for row in sorted_rows), dtype=np.float64, count=count
+    )
 
-    for i in range(1, len(errors)):
-        improvement = errors[i - 1] - errors[i]
-        if improvement < 0.01:
-            return ts[i]
-    return ts[-1]
+    # First t whose improvement over the previous t is < 0.01
+    small_gain = errors[:-1] - errors[1:] < 0.01
+    if small_gain.any():
+        return int(ts[np.argmax(small_gain) + 1])
+    return int(ts[-1])
 
 
 def compute_lsh_probabilities(
@@ -88,7 +142,8 @@ def compute_lsh_probabilities(
     params: lsh_lib.LshParams,
 ) -> dict[Pair, float]:
     """Compute LSH candidate probabilities for each pair."""
-    results: dict[Pair, float] = {}
-    for pair, sim in jaccard_by_pair.items():
-        results[pair] = lsh_lib.lsh_probability(sim, r=params.r, b=params.b)
-    return results
+    sims = np.fromiter(
+        jaccard_by_pair.values(), dtype=np.float64, count=len(jaccard_by_pair)
+    )
+    probabilities = lsh_lib.lsh_probability_vec(sims, params.r, params.b)
+    return dict(zip(jaccard_by_pair.keys(), probabilities.tolist()))
@@ -0,0 +1,30 @@
+"""Fixed-width table formatting for terminal output."""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+
+def format_table(
+    headers: Sequence[str],
+    rows: Sequence[Sequence[str]],
+    limit: int | None = None,
+) -> str:
+    """Format rows as a fixed-width table for terminal output.
+
+    If limit is given, only the first `limit` rows are shown.
+    """
+    if limit is not None:
+        rows = rows[:limit]
+    if not rows:
+        return "No rows to display."
+
+    widths = [
+        max(len(header), *map(len, column)) for header, column in zip(headers, zip(*rows))
+    ]
+    row_fmt = " | ".join("{:<" + str(width) + "}" for width in widths)
+
+    header_line = row_fmt.format(*headers)
+    separator = "-+-".join("-" * width for width in widths)
+    body_lines = [row_fmt.format(*row) for row in rows]
+    return "\n".join([header_line, separator, *body_lines])